@@ -1,16 +1,57 @@
 import fitz  # PyMuPDF
+import functools
+import heapq
 import re
-from collections import defaultdict, Counter
-from typing import List, Dict, Optional
+from typing import List, Dict, NamedTuple, Optional
 import os
 import json
 
+class Heading(NamedTuple):
+    level: str
+    text: str
+    page: int
+    size: float
+    origin_x: float
+    origin_y: float
+    bbox: tuple
+
+    def to_dict(self) -> Dict:
+        return {"level": self.level, "text": self.text, "page": self.page}
+
+
 class PDFOutlineExtractor:
+    _RE_NON_ALNUM = re.compile(r'[^a-zA-Z0-9\s]')
+    _RE_LOWER_NON_ALNUM = re.compile(r'[^a-z0-9\s]')
+    _RE_NUMERIC = re.compile(r'^\d+(\.\d+)*$')
+    _RE_NUMBERED = re.compile(r'^\d+(\.\d+)*\s*')
+    _RE_NUM_PREFIX = re.compile(r'^(\d+(\.\d+)*|[A-Z])\s*')
+    _RE_NUM_OR_CAP_PREFIX = re.compile(r'^(?:\d+(\.\d+)*\s+|[A-Z]\.\s+)')
+    _RE_SENTENCE_END = re.compile(r'[\.\?\!]$')
+    _RE_SINGLE_CAP = re.compile(r'^[A-Z]$')
+    _RE_BOLD = re.compile(r'bold|black|heavy|demi|bld|700|800|900')
+    # Form markers and labels are ASCII, so they can be counted on the UTF-8 bytes
+    _FORM_MARKERS = (b":_____", b": ___", b":\n")
+    _FORM_LABELS = (b"name:", b"date:", b"signature:", b"address:", b"phone:", b"email:",
+                    b"id number:", b"ssn:", b"account:")
+    # Image blocks are skipped everywhere, so don't ask MuPDF to extract them
+    _TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
     def __init__(self, document_title: str = "", is_first_page_cover: bool = False):
         self.document_title = document_title
         self.is_first_page_cover = is_first_page_cover
-        self.font_stats = defaultdict(lambda: {'char_count': 0, 'bold_count': 0})
+        # Constructor values, restored at the start of every extraction
+        self._default_document_title = document_title
+        self._default_is_first_page_cover = is_first_page_cover
+        self.font_char_counts: Dict[float, int] = {}
+        self.font_bold_counts: Dict[float, int] = {}
         self.page_dimensions = (0, 0)
+        self._page_dict_cache: Dict[int, dict] = {}
+        self._form_page_cache: Dict[int, bool] = {}
+        self._start_page = 0
+        self._num_pages = 0
+        self._hf_y_top = 0.0
+        self._hf_y_bot = 0.0
+        self._page_x_center = 0.0
 
         self.header_footer_threshold = 0.1
         self.min_heading_ratio = 1.3
@@ -22,18 +63,21 @@ class PDFOutlineExtractor:
         self.line_merge_tolerance_x = 20
         self.indentation_threshold = 25
 
-        self.non_heading_patterns = [
-            re.compile(r'^(figure|table|appendix|note:)\b', re.IGNORECASE),
+        # Text is stripped before matching, so only these two patterns can match a block
+        # whose first character is not a word character; every other pattern needs one.
+        self._symbol_led_patterns = [
             re.compile(r'^[•\-*·]\s'),
+            re.compile(r'^\s*©\s*\d{4}\s*'),
+        ]
+        # Same relative order as the original single pattern list.
+        # Labels ending in ':' are handled by the endswith(":") check instead.
+        self._word_led_patterns = [
+            re.compile(r'^(figure|table|appendix|note:)\b', re.IGNORECASE),
             re.compile(r'^\d+[/-]\d+$'),
             re.compile(r'^[A-Za-z]\d+$'),
             re.compile(r'^\s*\d+\s*$'),
-            re.compile(r'^[A-Z][A-Za-z]*:$'),
-            re.compile(r'^\w+/\w+:$'),
-            re.compile(r'^\d+\.\s*\w+:$'),
             re.compile(r'^(s\.?no\.?|sr\.?no\.?)$', re.IGNORECASE),
             re.compile(r'^(name|date|address|phone|email|id|sex|gender|age|signature|city|state|zip|country|total|amount|item|quantity|description|relation|relationship|value|unit|price|type|status|comments|notes|remarks|subtotal|tax|grand total)$', re.IGNORECASE),
-            re.compile(r'^\s*©\s*\d{4}\s*'),
             re.compile(r'^\s*all rights reserved\s*$', re.IGNORECASE),
             re.compile(r'^\s*confidential\s*$', re.IGNORECASE),
             re.compile(r'^\s*document\s+id:\s*', re.IGNORECASE),
@@ -48,46 +92,83 @@ class PDFOutlineExtractor:
 
         self.spaced_text_pattern = re.compile(r'\w\s{3,}\w')
 
-    def extract_outline(self, pdf_path: str) -> Dict:
+    def extract_outline(self, pdf_path: str, document_title: Optional[str] = None,
+                        is_first_page_cover: Optional[bool] = None) -> Dict:
+        self.document_title = document_title if document_title is not None else self._default_document_title
         try:
             doc = fitz.open(pdf_path)
-            if len(doc) == 0:
-                return {"title": self.document_title if self.document_title else os.path.splitext(os.path.basename(pdf_path))[0], "outline": []}
+        except Exception:
+            return {"title": self.document_title if self.document_title else os.path.splitext(os.path.basename(pdf_path))[0], "outline": []}
+
+        try:
+            return self.extract_outline_doc(doc, document_title, is_first_page_cover)
+        finally:
+            doc.close()
+
+    def extract_outline_doc(self, doc: fitz.Document, document_title: Optional[str] = None,
+                            is_first_page_cover: Optional[bool] = None) -> Dict:
+        # Works on an already opened document and leaves closing it to the caller.
+        # document_title / is_first_page_cover override the constructor values for this call
+        # only; None means the constructor value, never the previous document's.
+        self.document_title = document_title if document_title is not None else self._default_document_title
+        self.is_first_page_cover = is_first_page_cover if is_first_page_cover is not None else self._default_is_first_page_cover
+        self.font_char_counts = {}
+        self.font_bold_counts = {}
+
+        fallback_title = os.path.splitext(os.path.basename(doc.name))[0]
+        try:
+            self._num_pages = len(doc)
+            if self._num_pages == 0:
+                return {"title": self.document_title if self.document_title else fallback_title, "outline": []}
 
-            self.page_dimensions = (doc[0].rect.width, doc[0].rect.height)
+            first_page_rect = doc[0].rect
+            self.page_dimensions = (first_page_rect.width, first_page_rect.height)
+            self._hf_y_top = self.page_dimensions[1] * self.header_footer_threshold
+            self._hf_y_bot = self.page_dimensions[1] * (1 - self.header_footer_threshold)
+            self._page_x_center = self.page_dimensions[0] * 0.5
+            self._start_page = 1 if self.is_first_page_cover else 0
 
             self._analyze_document_styles(doc)
 
             if not self.document_title:
                 extracted_title = self._extract_document_title(doc)
-                self.document_title = extracted_title if extracted_title else os.path.splitext(os.path.basename(pdf_path))[0]
+                self.document_title = extracted_title if extracted_title else fallback_title
 
             outline_candidates = self._extract_headings_from_content(doc)
 
             refined_outline = self._refine_hierarchy(outline_candidates)
 
-            return refined_outline
+            return [heading.to_dict() for heading in refined_outline]
 
         except Exception as e:
-            return {"title": self.document_title if self.document_title else os.path.splitext(os.path.basename(pdf_path))[0], "outline": []}
+            return {"title": self.document_title if self.document_title else fallback_title, "outline": []}
         finally:
-            if 'doc' in locals():
-                doc.close()
+            self._page_dict_cache.clear()
+            self._form_page_cache.clear()
+
+    def _page_dict(self, doc: fitz.Document, page_num: int) -> dict:
+        page_dict = self._page_dict_cache.get(page_num)
+        if page_dict is None:
+            page_dict = doc[page_num].get_text("dict", flags=self._TEXT_FLAGS)
+            self._page_dict_cache[page_num] = page_dict
+        return page_dict
+
+    def _page_text(self, doc: fitz.Document, page_num: int) -> str:
+        # Same line-per-row text as page.get_text(), rebuilt from the cached dict
+        return "".join("".join(span["text"] for span in line["spans"]) + "\n"
+                       for block in self._page_dict(doc, page_num)["blocks"] if block["type"] == 0
+                       for line in block["lines"])
 
     def _analyze_document_styles(self, doc: fitz.Document) -> None:
-        start_page_idx = 1 if self.is_first_page_cover else 0
-        analyze_pages_count = min(20, len(doc) - start_page_idx)
+        end_page = min(self._start_page + 20, self._num_pages)
 
-        for i in range(analyze_pages_count):
-            page_num = start_page_idx + i
-            if page_num >= len(doc):
-                break
+        for page_num in range(self._start_page, end_page):
             page = doc[page_num]
 
-            if self._is_form_page(page):
+            if self._is_form_page(doc, page):
                 continue
 
-            blocks = page.get_text("dict")["blocks"]
+            blocks = self._page_dict(doc, page_num)["blocks"]
 
             for block in blocks:
                 if block["type"] != 0:
@@ -108,12 +189,12 @@ class PDFOutlineExtractor:
                         if not text:
                             continue
 
-                        self.font_stats[font_size]['char_count'] += len(text)
+                        self.font_char_counts[font_size] = self.font_char_counts.get(font_size, 0) + len(text)
                         if is_bold:
-                            self.font_stats[font_size]['bold_count'] += len(text)
+                            self.font_bold_counts[font_size] = self.font_bold_counts.get(font_size, 0) + len(text)
 
-    def _extract_headings_from_content(self, doc: fitz.Document) -> List[Dict]:
-        if not self.font_stats:
+    def _extract_headings_from_content(self, doc: fitz.Document) -> List[Heading]:
+        if not self.font_char_counts:
             return []
 
         body_size = self._determine_body_text_size()
@@ -123,75 +204,64 @@ class PDFOutlineExtractor:
             return []
 
         outline_candidates = []
-        prev_heading_context = None
-
-        start_page_idx = 1 if self.is_first_page_cover else 0
+        prev_heading = None
 
-        for page_num_0_indexed in range(start_page_idx, len(doc)):
+        for page_num_0_indexed in range(self._start_page, self._num_pages):
             page = doc[page_num_0_indexed]
 
-            if self._is_form_page(page):
+            if self._is_form_page(doc, page):
                 continue
 
-            text_blocks_on_page = self._get_clean_text_blocks(page)
+            text_blocks_on_page = self._get_clean_text_blocks(doc, page_num_0_indexed)
 
             for block in text_blocks_on_page:
                 if self._is_heading_candidate(block, body_size):
-                    level = self._determine_heading_level(block, heading_styles, prev_heading_context)
-
-                    entry = {
-                        "level": level,
-                        "text": block["text"],
-                        "page": page_num_0_indexed
-                    }
-
-                    outline_candidates.append(entry)
-                    prev_heading_context = {
-                        "level": level,
-                        "size": block["size"],
-                        "origin_x": block["origin_x"],
-                        "origin_y": block["origin_y"],
-                        "bbox": block["bbox"]
-                    }
+                    level = self._determine_heading_level(block, heading_styles, prev_heading)
+
+                    prev_heading = Heading(level, block["text"], page_num_0_indexed, block["size"],
+                                           block["origin_x"], block["origin_y"], tuple(block["bbox"]))
+                    outline_candidates.append(prev_heading)
 
         return outline_candidates
 
-    def _is_form_page(self, page: fitz.Page) -> bool:
-        widgets = list(page.widgets())
-        if widgets:
-            form_area = sum(w.rect.width * w.rect.height for w in widgets)
-            page_area = self.page_dimensions[0] * self.page_dimensions[1]
-            if (form_area / page_area) > self.form_field_threshold:
+    def _is_form_page(self, doc: fitz.Document, page: fitz.Page) -> bool:
+        # Style analysis and heading extraction both ask about the same pages
+        is_form = self._form_page_cache.get(page.number)
+        if is_form is None:
+            is_form = self._detect_form_page(doc, page)
+            self._form_page_cache[page.number] = is_form
+        return is_form
+
+    def _detect_form_page(self, doc: fitz.Document, page: fitz.Page) -> bool:
+        threshold_area = self.form_field_threshold * self.page_dimensions[0] * self.page_dimensions[1]
+        form_area = 0.0
+        for widget in page.widgets():
+            rect = widget.rect
+            form_area += (rect.x1 - rect.x0) * (rect.y1 - rect.y0)
+            if form_area > threshold_area:
                 return True
 
-        text = page.get_text()
+        text = self._page_text(doc, page.number).encode("utf-8", "ignore")
         form_indications = 0
 
-        form_indications += text.count(":_____")
-        form_indications += text.count(": ___")
-        form_indications += text.count(":\n")
+        form_indications += sum(text.count(marker) for marker in self._FORM_MARKERS)
 
-        form_labels = ["name:", "date:", "signature:", "address:", "phone:", "email:", "id number:", "ssn:", "account:"]
-        form_indications += sum(text.lower().count(label) for label in form_labels)
+        text_lower = text.lower()
+        form_indications += sum(text_lower.count(label) for label in self._FORM_LABELS)
 
-        if "|   |" in text or "|___|" in text or "___ " * 3 in text:
+        if b"|   |" in text or b"|___|" in text or b"___ " * 3 in text:
             form_indications += 3
 
         return form_indications >= 3
 
     def _is_header_footer(self, line_bbox: List[float]) -> bool:
-        y_pos_ratio = line_bbox[1] / self.page_dimensions[1]
-
-        if (y_pos_ratio < self.header_footer_threshold or
-                y_pos_ratio > 1 - self.header_footer_threshold):
+        # Bounds are precomputed from the first page's size in extract_outline
+        y_top = line_bbox[1]
+        if y_top < self._hf_y_top or y_top > self._hf_y_bot:
             return True
 
-        x_center = self.page_dimensions[0] / 2
-        line_center = (line_bbox[0] + line_bbox[2]) / 2
-        if abs(line_center - x_center) < 20:
-            return True
-
-        return False
+        line_center = (line_bbox[0] + line_bbox[2]) * 0.5
+        return abs(line_center - self._page_x_center) < 20
 
     def _is_spaced_text(self, text: str) -> bool:
         if self.spaced_text_pattern.search(text):
@@ -206,8 +276,7 @@ class PDFOutlineExtractor:
     def _is_heading_candidate(self, block: Dict, body_size: float) -> bool:
         text = block["text"].strip()
 
-        cleaned_text_for_comparison = re.sub(r'^[•\-\*\s]+|[•\-\*\s]+$', '', text).strip()
-        cleaned_text_for_comparison = re.sub(r'[^a-zA-Z0-9\s]', '', cleaned_text_for_comparison).strip()
+        cleaned_text_for_comparison = self._RE_NON_ALNUM.sub('', text).strip()
 
         if not text:
             return False
@@ -218,7 +287,7 @@ class PDFOutlineExtractor:
         word_count = len(cleaned_text_for_comparison.split())
 
         if word_count == 1:
-            if not re.match(r'^\d+(\.\d+)*$', cleaned_text_for_comparison):
+            if not self._RE_NUMERIC.match(cleaned_text_for_comparison):
                 if len(cleaned_text_for_comparison) < self.min_heading_length:
                     return False
         elif word_count < 1:
@@ -227,17 +296,22 @@ class PDFOutlineExtractor:
         if len(text) > self.max_heading_length:
             return False
 
-        for pattern in self.non_heading_patterns:
-            if pattern.match(text):
-                return False
-
         if text.endswith(":"):
             return False
 
+        first_char = text[0]
+        if first_char.isalnum() or first_char == '_':
+            patterns = self._word_led_patterns
+        else:
+            patterns = self._symbol_led_patterns
+        for pattern in patterns:
+            if pattern.match(text):
+                return False
+
         if "|" in text:
             return False
 
-        if word_count <= 2 and text.isupper() and not re.match(r'^\d+(\.\d+)*\s*', text):
+        if word_count <= 2 and text.isupper() and not self._RE_NUMBERED.match(text):
             return False
 
         if self._is_spaced_text(text):
@@ -254,15 +328,15 @@ class PDFOutlineExtractor:
 
         looks_like_sentence = (text[0].isupper() and
                                word_count > 3 and
-                               re.search(r'[\.\?\!]$', text))
+                               self._RE_SENTENCE_END.search(text))
 
-        is_strong_heading_pattern = text.isupper() or re.match(r'^(?:\d+(\.\d+)*|[A-Z])\s*', text)
+        is_strong_heading_pattern = text.isupper() or self._RE_NUM_PREFIX.match(text)
 
         if looks_like_sentence and not is_strong_heading_pattern:
             if not is_bold_enough and size_ratio < self.min_heading_ratio * 1.2:
                 return False
 
-        if re.match(r'^(?:\d+(\.\d+)*\s+|[A-Z]\.\s+)', text):
+        if self._RE_NUM_OR_CAP_PREFIX.match(text):
             return True
 
         if text.isupper() and word_count > 1:
@@ -270,9 +344,9 @@ class PDFOutlineExtractor:
 
         return True
 
-    def _get_clean_text_blocks(self, page: fitz.Page) -> List[Dict]:
+    def _get_clean_text_blocks(self, doc: fitz.Document, page_num: int) -> List[Dict]:
         blocks = []
-        text_blocks = page.get_text("dict")["blocks"]
+        text_blocks = self._page_dict(doc, page_num)["blocks"]
 
         current_merged_block = None
 
@@ -288,8 +362,8 @@ class PDFOutlineExtractor:
                     continue
 
                 line_text = ""
-                size_counter = Counter()
-                bold_counter = Counter()
+                size_totals = {}
+                bold_totals = {}
 
                 for span in line["spans"]:
                     span_text = span["text"]
@@ -298,15 +372,17 @@ class PDFOutlineExtractor:
 
                     line_text += span_text
                     size = round(span["size"], 1)
-                    size_counter[size] += len(span_text)
-                    bold_counter[self._is_bold_font(span["font"])] += len(span_text)
+                    is_bold = self._is_bold_font(span["font"])
+                    size_totals[size] = size_totals.get(size, 0) + len(span_text)
+                    bold_totals[is_bold] = bold_totals.get(is_bold, 0) + len(span_text)
 
                 line_text = line_text.strip()
                 if not line_text:
                     continue
 
-                dominant_size = size_counter.most_common(1)[0][0] if size_counter else 0
-                dominant_bold = bold_counter.most_common(1)[0][0] if bold_counter else False
+                # max() keeps the first style seen on the line when counts tie
+                dominant_size = max(size_totals, key=size_totals.get) if size_totals else 0
+                dominant_bold = max(bold_totals, key=bold_totals.get) if bold_totals else False
 
                 line_info = {
                     "text": line_text,
@@ -338,29 +414,32 @@ class PDFOutlineExtractor:
         return blocks
 
     def _determine_body_text_size(self) -> float:
-        if not self.font_stats:
+        if not self.font_char_counts:
             return 11.0
 
-        body_candidates = [size for size in self.font_stats
+        char_counts = self.font_char_counts
+        bold_counts = self.font_bold_counts
+
+        def non_bold_chars(size: float) -> int:
+            return char_counts[size] - bold_counts.get(size, 0)
+
+        body_candidates = [size for size in char_counts
                            if 8 <= size <= 14]
 
         if not body_candidates:
-            if self.font_stats:
-                return max(self.font_stats, key=lambda s: (self.font_stats[s]['char_count'] - self.font_stats[s]['bold_count']))
-            return 11.0
+            return max(char_counts, key=non_bold_chars)
 
-        return max(body_candidates,
-                   key=lambda s: (self.font_stats[s]['char_count'] - self.font_stats[s]['bold_count']))
+        return max(body_candidates, key=non_bold_chars)
 
     def _identify_heading_styles(self, body_size: float) -> List[Dict]:
         heading_candidates = []
 
-        for size, stats in self.font_stats.items():
+        for size, char_count in self.font_char_counts.items():
             if size <= body_size * 0.95:
                 continue
 
             size_ratio = size / body_size
-            is_bold_likely = (stats['bold_count'] / max(1, stats['char_count'])) > 0.6
+            is_bold_likely = (self.font_bold_counts.get(size, 0) / max(1, char_count)) > 0.6
 
             if size_ratio >= self.min_heading_ratio or is_bold_likely:
                 score = size_ratio * 50 + (40 if is_bold_likely else 0)
@@ -368,37 +447,31 @@ class PDFOutlineExtractor:
                     "size": size,
                     "is_bold": is_bold_likely,
                     "score": score,
-                    "char_count": stats['char_count']
+                    "char_count": char_count
                 })
 
-        sorted_candidates = sorted(heading_candidates,
-                                   key=lambda x: (-x['score'], -x['size'], -x['char_count']))
+        # Only the best three distinct styles are needed, so pop from a heap instead of
+        # sorting every candidate; the index keeps ties in their original order.
+        candidate_heap = [(-style['score'], -style['size'], -style['char_count'], i, style)
+                          for i, style in enumerate(heading_candidates)]
+        heapq.heapify(candidate_heap)
 
         distinct_styles = []
-        seen_sizes = set()
-
-        for style in sorted_candidates:
-            is_distinct = True
-            for s_size in seen_sizes:
-                if abs(style["size"] - s_size) < 0.5:
-                    is_distinct = False
-                    break
 
-            if is_distinct:
+        while candidate_heap and len(distinct_styles) < 3:
+            style = heapq.heappop(candidate_heap)[-1]
+            if all(abs(style["size"] - seen["size"]) >= 0.5 for seen in distinct_styles):
                 distinct_styles.append(style)
-                seen_sizes.add(style["size"])
-                if len(distinct_styles) >= 3:
-                    break
 
         return distinct_styles
 
     def _determine_heading_level(self, block: Dict,
                                  heading_styles: List[Dict],
-                                 prev_heading: Optional[Dict]) -> str:
+                                 prev_heading: Optional[Heading]) -> str:
         current_text = block["text"].strip()
         current_level_num = 3
 
-        match_prefix = re.match(r'^(\d+(\.\d+)*|[A-Z])\s*', current_text)
+        match_prefix = self._RE_NUM_PREFIX.match(current_text)
         if match_prefix:
             prefix = match_prefix.group(1)
             dot_count = prefix.count('.')
@@ -423,12 +496,12 @@ class PDFOutlineExtractor:
                 elif size_ratio_to_h1 > 0.7 and current_level_num > 2: current_level_num = 2
 
         if prev_heading:
-            prev_level_num = int(prev_heading["level"][1])
+            prev_level_num = int(prev_heading.level[1])
 
             if current_level_num > prev_level_num + 1:
                 current_level_num = prev_level_num + 1
 
-            if block["origin_x"] > prev_heading["origin_x"] + self.indentation_threshold:
+            if block["origin_x"] > prev_heading.origin_x + self.indentation_threshold:
                 if current_level_num <= prev_level_num:
                     current_level_num = prev_level_num + 1
 
@@ -436,23 +509,22 @@ class PDFOutlineExtractor:
 
             is_strongly_left_aligned = abs(block["origin_x"] - typical_left_margin_x) < 30
 
-            if prev_heading["size"] > 0 and \
-               block["size"] > prev_heading["size"] * 1.5 and \
+            if prev_heading.size > 0 and \
+               block["size"] > prev_heading.size * 1.5 and \
                is_strongly_left_aligned and \
                current_level_num > 1:
                 current_level_num = 1
 
-            if prev_heading.get("bbox") and prev_heading["bbox"][3] is not None:
-                vertical_gap = block["origin_y"] - prev_heading["bbox"][3]
-                if vertical_gap > (block["size"] * 2.5) and is_strongly_left_aligned and current_level_num > 1:
-                    current_level_num = 1
+            vertical_gap = block["origin_y"] - prev_heading.bbox[3]
+            if vertical_gap > (block["size"] * 2.5) and is_strongly_left_aligned and current_level_num > 1:
+                current_level_num = 1
 
-            if block["size"] < prev_heading["size"] * 0.9 and current_level_num <= prev_level_num:
+            if block["size"] < prev_heading.size * 0.9 and current_level_num <= prev_level_num:
                 current_level_num = prev_level_num + 1
 
         return f"H{min(current_level_num, 3)}"
 
-    def _refine_hierarchy(self, outline_candidates: List[Dict]) -> List[Dict]:
+    def _refine_hierarchy(self, outline_candidates: List[Heading]) -> List[Heading]:
         if not outline_candidates:
             return []
 
@@ -461,9 +533,9 @@ class PDFOutlineExtractor:
 
         for entry in outline_candidates:
             if (last_entry and
-                    entry["text"] == last_entry["text"] and
-                    entry["level"] == last_entry["level"] and
-                    entry["page"] == last_entry["page"]):
+                    entry.text == last_entry.text and
+                    entry.level == last_entry.level and
+                    entry.page == last_entry.page):
                 continue
 
             refined_outline.append(entry)
@@ -477,11 +549,11 @@ class PDFOutlineExtractor:
                 current_entry = refined_outline[i]
                 prev_entry = final_cleaned_outline[-1]
 
-                curr_level_num = int(current_entry["level"][1])
-                prev_level_num = int(prev_entry["level"][1])
+                curr_level_num = int(current_entry.level[1])
+                prev_level_num = int(prev_entry.level[1])
 
                 if curr_level_num > prev_level_num + 1:
-                    current_entry["level"] = f"H{prev_level_num + 1}"
+                    current_entry = current_entry._replace(level=f"H{prev_level_num + 1}")
 
                 common_short_words_to_exclude = {
                     "s.no", "name", "date", "id", "no", "description", "quantity", "total",
@@ -490,10 +562,10 @@ class PDFOutlineExtractor:
                     "code", "ref", "part", "model", "serial", "data", "key", "number"
                 }
 
-                cleaned_text_lower = re.sub(r'[^a-z0-9\s]', '', current_entry["text"].lower()).strip()
+                cleaned_text_lower = self._RE_LOWER_NON_ALNUM.sub('', current_entry.text.lower()).strip()
 
                 if len(cleaned_text_lower.split()) == 1 and cleaned_text_lower in common_short_words_to_exclude:
-                    if not re.match(r'^\d+(\.\d+)*\s*', current_entry["text"]):
+                    if not self._RE_NUMBERED.match(current_entry.text):
                         continue
 
                 final_cleaned_outline.append(current_entry)
@@ -501,15 +573,10 @@ class PDFOutlineExtractor:
         return final_cleaned_outline
 
     def _extract_document_title(self, doc: fitz.Document) -> str:
-        if len(doc) == 0:
-            return ""
-
-        start_page_idx = 0 if not self.is_first_page_cover else 1
-        if start_page_idx >= len(doc):
+        if self._start_page >= self._num_pages:
             return ""
 
-        page = doc[start_page_idx]
-        blocks_on_page = page.get_text("dict")["blocks"]
+        blocks_on_page = self._page_dict(doc, self._start_page)["blocks"]
 
         title_candidates = []
 
@@ -552,8 +619,8 @@ class PDFOutlineExtractor:
             potential_main_title = None
             for cand in title_candidates:
                 if cand["size"] >= title_candidates[0]["size"] * 0.85 and \
-                   not re.match(r'^\d+(\.\d+)*$', cand["text"].strip()) and \
-                   not re.match(r'^[A-Z]$', cand["text"].strip()) and \
+                   not self._RE_NUMERIC.match(cand["text"].strip()) and \
+                   not self._RE_SINGLE_CAP.match(cand["text"].strip()) and \
                    len(cand["text"].split()) > 1:
                     potential_main_title = cand
                     break
@@ -584,7 +651,7 @@ class PDFOutlineExtractor:
 
                     if (next_part["text"][0].islower() and len(next_part["text"].split()) > 7) or \
                        (len(next_part["text"].split()) < 3 and not next_part["text"].isupper() and \
-                        not re.match(r'^\d+(\.\d+)*\s*', next_part["text"])):
+                        not self._RE_NUMBERED.match(next_part["text"])):
                         break
 
                     final_title_parts.append(next_part["text"])
@@ -597,10 +664,9 @@ class PDFOutlineExtractor:
         return " ".join(final_title_parts)
 
     @staticmethod
+    @functools.lru_cache(maxsize=256)
     def _is_bold_font(font_name: str) -> bool:
         if not font_name:
             return False
 
-        font_lower = font_name.lower()
-        return any(keyword in font_lower
-                   for keyword in ["bold", "black", "heavy", "demi", "bld", "700", "800", "900"])
\ No newline at end of file
+        return PDFOutlineExtractor._RE_BOLD.search(font_name.lower()) is not None
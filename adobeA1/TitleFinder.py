@@ -1,8 +1,13 @@
 import os
-import pdfplumber
-from collections import defaultdict
+from itertools import groupby
+import fitz  # PyMuPDF
 
 class TitleFinder:
+    # Image blocks are never looked at, so don't ask MuPDF to extract them
+    _TEXT_FLAGS = fitz.TEXTFLAGS_RAWDICT & ~fitz.TEXT_PRESERVE_IMAGES
+    # Word sizes within this many points count as the same title font size
+    _SIZE_TOLERANCE = 0.5
+
     def __init__(self):
         self.title = ""
         self.title_page = 1
@@ -10,67 +15,144 @@ class TitleFinder:
         self.title_font_name = ""
 
     def find_title(self, pdf_path):
-        with pdfplumber.open(pdf_path) as pdf:
-            first_content_page, page_num = self._find_first_content_page(pdf)
-            self.title_page = page_num
+        with fitz.open(pdf_path) as pdf:
+            return self.find_title_doc(pdf)
+
+    def find_title_doc(self, pdf):
+        # Works on an already opened fitz.Document and leaves closing it to the caller.
+        # State is reset per call so one TitleFinder can be reused across documents.
+        self.title = ""
+        self.title_font_size = 0
+        self.title_font_name = ""
+
+        first_content_blocks, page_num = self._find_first_content_page(pdf)
+        self.title_page = page_num
 
-            if first_content_page:
-                words = self._safe_extract_words(first_content_page)
+        if first_content_blocks:
+            words = self._safe_extract_words(first_content_blocks)
 
-                current_title_words = []
-                current_font_size = 0
-                current_font_name = ""
+            current_title_words = []
+            current_font_size = 0
+            current_font_name = ""
 
-                for word in words:
-                    font_size = word.get("size", 0)
-                    font_name = word.get("fontname", "unknown")
-                    text = word.get("text", "")
+            for word in words:
+                font_size = word.get("size", 0)
+                font_name = word.get("fontname", "unknown")
+                text = word.get("text", "")
 
-                    # Basic filter: ignore super-short or numeric strings
-                    if len(text.strip()) <= 2 or text.isdigit():
-                        continue
+                # Basic filter: ignore super-short or numeric strings
+                if len(text.strip()) <= 2 or text.isdigit():
+                    continue
 
-                    # Set new dominant font if larger size
-                    if font_size > current_font_size:
-                        current_title_words = [text]
-                        current_font_size = font_size
-                        current_font_name = font_name
+                # Set new dominant font if larger size
+                if font_size > current_font_size + self._SIZE_TOLERANCE:
+                    current_title_words = [text]
+                    current_font_size = font_size
+                    current_font_name = font_name
 
-                    elif font_size == current_font_size and font_name == current_font_name:
-                        current_title_words.append(text)
+                elif abs(font_size - current_font_size) <= self._SIZE_TOLERANCE and font_name == current_font_name:
+                    current_title_words.append(text)
 
-                # Join and clean title
-                raw_title = " ".join(current_title_words).strip()
-                self.title = self._deduplicate_title(raw_title)
-                self.title_font_size = current_font_size
-                self.title_font_name = current_font_name
+            # Join and clean title
+            raw_title = " ".join(current_title_words).strip()
+            self.title = self._deduplicate_title(raw_title)
+            self.title_font_size = current_font_size
+            self.title_font_name = current_font_name
 
         return {
-            "title": self.title if self.title else os.path.splitext(os.path.basename(pdf_path))[0],
+            "title": self.title if self.title else os.path.splitext(os.path.basename(pdf.name))[0],
             "page": self.title_page
         }
 
     def _find_first_content_page(self, pdf):
-        for page_num, page in enumerate(pdf.pages, start=1):
+        # Returns the rawdict blocks of the first page with any text, so the title words
+        # are built from the same extraction
+        for page_num, page in enumerate(pdf, start=1):
             try:
-                if page.extract_text() and page.extract_text().strip():
-                    return page, page_num
-            except:
+                blocks = page.get_text("rawdict", flags=self._TEXT_FLAGS)["blocks"]
+            except Exception:
                 continue
+            if any(not char["c"].isspace()
+                   for block in blocks if block["type"] == 0
+                   for line in block["lines"]
+                   for span in line["spans"]
+                   for char in span["chars"]):
+                return blocks, page_num
         return None, 1
 
-    def _safe_extract_words(self, page):
-        try:
-            words = page.extract_words(extra_attrs=["size", "fontname"])
-            return [{"text": w["text"],
-                     "size": w.get("size", 0),
-                     "fontname": w.get("fontname", "unknown")}
-                    for w in words]
-        except:
-            return []
+    def _safe_extract_words(self, blocks):
+        # Port of pdfplumber's extract_words(extra_attrs=["size", "fontname"]) on MuPDF
+        # characters: chars are clustered into lines by top, ordered by x0 within a line,
+        # and a word ends at whitespace, a font change or a horizontal gap > 3pt.
+        # Sizes are not a word boundary: MuPDF's span sizes vary along a line with
+        # horizontal scaling, where pdfplumber reported one glyph height for all of them.
+        chars = []
+        seen = set()
+        for block in blocks:
+            if block["type"] != 0:
+                continue
+            for line in block["lines"]:
+                for span in line["spans"]:
+                    em_height = span["ascender"] - span["descender"]
+                    for char in span["chars"]:
+                        x0, top, x1, bottom = char["bbox"]
+                        # Overprinted copies of the same glyph (fake bold) only count once
+                        key = (char["c"], round(x0, 1), round(top, 1))
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        # Glyph box height over the font's em box gives the vertically scaled
+                        # font size, which is what pdfplumber reported as "size"
+                        size = round((bottom - top) / em_height, 2) if em_height > 0 else span["size"]
+                        chars.append((top, x0, x1, char["c"], size, span["font"]))
+
+        words = []
+        current = []
+
+        def finish_word():
+            text = "".join(c[3] for c in current)
+            # Rules and leaders ("-----", "....") aren't words
+            if any(ch.isalnum() for ch in text):
+                words.append({"text": text, "size": max(c[4] for c in current), "fontname": current[0][5]})
+            current.clear()
+
+        for line_chars in self._cluster_lines(chars):
+            for char in sorted(line_chars, key=lambda c: c[1]):
+                if char[3].isspace():
+                    if current:
+                        finish_word()
+                    continue
+                if current:
+                    prev = current[-1]
+                    new_font = char[5] != prev[5]
+                    new_position = char[1] < prev[1] or char[1] > prev[2] + 3 or char[0] > prev[0] + 3
+                    if new_font or new_position:
+                        finish_word()
+                current.append(char)
+            if current:
+                finish_word()
+        return words
+
+    def _cluster_lines(self, chars):
+        # Groups chars whose tops are within 3pt of the previous one, in top order;
+        # each line keeps the chars in extraction order, like pdfplumber's cluster_objects
+        lines = []
+        last_top = None
+        for i in sorted(range(len(chars)), key=lambda i: chars[i][0]):
+            if last_top is None or chars[i][0] > last_top + 3:
+                lines.append([])
+            lines[-1].append(i)
+            last_top = chars[i][0]
+        return [[chars[i] for i in sorted(line)] for line in lines]
 
     def _deduplicate_title(self, text):
         # Remove repeated characters like "RRRR" → "R", "PPPrrrrooooppppooooss..." → "Proposal"
-        import re
-        # Remove 3 or more repeated characters in a row
-        return re.sub(r'(.)\1{2,}', r'\1', text)
+        # Collapse runs of 3 or more repeated characters (newlines excepted) to one
+        parts = []
+        for char, run in groupby(text):
+            run_length = sum(1 for _ in run)
+            if run_length >= 3 and char != "\n":
+                parts.append(char)
+            else:
+                parts.append(char * run_length)
+        return "".join(parts)
@@ -1,4 +1,116 @@
+import logging
+import os
+import sqlite3
+from contextlib import closing
+from sys import intern
 import fitz # PyMuPDF
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+# Image blocks are skipped by the text analysis (image coverage comes from get_image_info),
+# so don't ask MuPDF to extract them
+_TEXT_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+def _get_toc(document):
+    """
+    Returns document.get_toc(), computing it only once per document object.
+    The result is stored on the document itself, so it lives exactly as long as the document.
+    """
+    toc = getattr(document, "_cover_toc", None)
+    if toc is None:
+        toc = document.get_toc()
+        document._cover_toc = toc
+    return toc
+
+# Results of previous cover checks, keyed by file identity (path, size, mtime) plus the
+# page and heuristic parameters. Always kept in memory; repeated runs over the same input
+# directory can also persist them to a SQLite sidecar by setting the COVER_CACHE_PATH
+# environment variable. SQLite (rather than shelve) because pool workers write concurrently.
+COVER_CACHE_PATH = os.environ.get("COVER_CACHE_PATH")
+# Part of every cache key; bump it whenever the heuristics change so old results are not reused
+_COVER_HEURISTICS_VERSION = 1
+_COVER_CACHE_MAX_ENTRIES = 4096
+_cover_cache = {}
+
+def _cover_cache_key(pdf_path, page_number, kwargs):
+    """
+    Returns the cache key for a cover check, or None if pdf_path is not a file on disk.
+    A changed file (size or mtime) or heuristics version yields a new key.
+    """
+    try:
+        stat = os.stat(pdf_path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return f"{_COVER_HEURISTICS_VERSION}:{os.path.abspath(pdf_path)}:{stat.st_size}:{stat.st_mtime_ns}:{page_number}:{sorted(kwargs.items())}"
+
+def _cover_cache_get(key):
+    """
+    Returns the cached result for key, or None on a miss.
+    """
+    if key is None:
+        return None
+    result = _cover_cache.get(key)
+    if result is not None or not COVER_CACHE_PATH:
+        return result
+    try:
+        with closing(sqlite3.connect(COVER_CACHE_PATH, timeout=10)) as conn:
+            row = conn.execute("SELECT is_cover FROM cover_cache WHERE key = ?", (key,)).fetchone()
+    except sqlite3.Error as e:
+        log.debug("Cover cache lookup failed: %s", e)
+        return None
+    if row is None:
+        return None
+    result = bool(row[0])
+    _cover_cache_remember(key, result)
+    return result
+
+def _cover_cache_remember(key, result):
+    if len(_cover_cache) >= _COVER_CACHE_MAX_ENTRIES:
+        _cover_cache.clear()
+    _cover_cache[key] = result
+
+def _cover_cache_put(key, result):
+    """
+    Stores result for key in memory and, if enabled, in the on-disk cache.
+    """
+    if key is None:
+        return
+    _cover_cache_remember(key, result)
+    if not COVER_CACHE_PATH:
+        return
+    try:
+        with closing(sqlite3.connect(COVER_CACHE_PATH, timeout=10)) as conn, conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS cover_cache (key TEXT PRIMARY KEY, is_cover INTEGER)")
+            conn.execute("INSERT OR REPLACE INTO cover_cache VALUES (?, ?)", (key, int(result)))
+    except sqlite3.Error as e:
+        log.debug("Cover cache write failed: %s", e)
+
+def _has_significant_image(page, page_area, min_image_area_ratio):
+    """
+    Heuristic 2: Image Presence. True if images cover more than min_image_area_ratio of the page.
+    Only needed for the no-text and sparse-page fallbacks, so it is evaluated lazily.
+    """
+    if page_area <= 0:
+        has_significant_image = 0 > min_image_area_ratio
+        log.debug("  has_significant_image: %s (Page area: %.2f)", has_significant_image, page_area)
+        return has_significant_image
+
+    # Only the ratio matters, so compare against an absolute area and stop once it is exceeded
+    threshold_area = min_image_area_ratio * page_area
+    total_image_area = 0
+
+    for img_info in page.get_image_info():
+        if 'bbox' in img_info and 'width' in img_info and 'height' in img_info:
+            if img_info['width'] > 0 and img_info['height'] > 0:
+                total_image_area += img_info['width'] * img_info['height']
+                if total_image_area > threshold_area:
+                    break
+    
+    has_significant_image = total_image_area > threshold_area
+    log.debug("  has_significant_image: %s (Total area: %.2f, Page area: %.2f, Threshold: %s)",
+              has_significant_image, total_image_area, page_area, min_image_area_ratio)
+    return has_significant_image
 
 def _analyze_page_for_cover_characteristics(page, document, max_body_text_lines=8, min_image_area_ratio=0.02, min_prominent_font_ratio=1.2, min_prominent_elements=1, max_prominent_elements=15, title_centering_threshold=0.30, title_vertical_pos_threshold=0.5):
     """
@@ -17,35 +129,66 @@ def _analyze_page_for_cover_characteristics(page, document, max_body_text_lines=
         title_centering_threshold (float): Max deviation from center for main title.
         title_vertical_pos_threshold (float): Max vertical position (from top, as ratio of page height) for main title.
                                               e.g., 0.5 means title must be in upper half.
+
+    Returns:
+        bool: True if the page looks like a cover page, or None if the analysis failed.
     """
     page_name = f"Page {page.number + 1} of {document.name if hasattr(document, 'name') else 'unknown_document'}"
-    print(f"\n--- Analyzing {page_name} ---")
+    log.debug("--- Analyzing %s ---", page_name)
 
     try:
+        # page.rect builds a new Rect on every access, so read it once
+        page_rect = page.rect
+        page_width = page_rect.width
+        page_height = page_rect.height
+        page_area = page_width * page_height
+
         # --- TOC Check (Strongest Indicator) ---
-        toc = document.get_toc()
+        toc = _get_toc(document)
         if toc:
             first_toc_page = toc[0][2] if toc and len(toc[0]) > 2 else -1 
             if first_toc_page == page.number + 1 and page.number == 0:
                 # TOC starts on page 1, and this is page 1. Likely a content page, let other heuristics decide.
-                print(f"  TOC starts on page 1. Likely content page. Continuing heuristics.")
+                log.debug("  TOC starts on page 1. Likely content page. Continuing heuristics.")
             elif first_toc_page > 1 and page.number == 0: # TOC starts on page 2 or later, and this is page 1
-                print(f"  Result for {page_name}: True (Reason: TOC starts on page {first_toc_page}, so page 1 is likely cover)")
+                log.debug("  Result for %s: True (Reason: TOC starts on page %s, so page 1 is likely cover)", page_name, first_toc_page)
                 return True
 
 
-        # --- Extract all text spans and blocks ---
-        text_blocks = page.get_text("dict")["blocks"]
-        spans = []
-        full_page_text = ""
+        # --- Extract all text spans, blocks and unique lines in a single pass ---
+        text_blocks = page.get_text("dict", flags=_TEXT_FLAGS)["blocks"]
+        # Only the size and text of each span are kept (index i of one matches the other),
+        # plus the first of the largest spans as the main title candidate
+        span_sizes = []
+        span_texts = []
+        main_title_span = None
+        main_title_size = -1.0
+        unique_lines = {} # normalized line text -> largest font size seen on that line
         for b in text_blocks:
             if b["type"] == 0: # Only process text blocks
                 for line in b["lines"]:
-                    line_text = " ".join(s["text"] for s in line["spans"]).strip()
-                    spans.extend(line["spans"])
-                    full_page_text += line_text + "\n" # Collect text for keyword search
+                    # Gather the span sizes, texts and the line's largest font size in one walk over its spans
+                    line_start = len(span_texts)
+                    max_line_font_size = 0
+                    for s in line["spans"]:
+                        size = s["size"]
+                        span_sizes.append(size)
+                        span_texts.append(s["text"])
+                        if size > max_line_font_size:
+                            max_line_font_size = size
+                        if size > main_title_size:
+                            main_title_span = s
+                            main_title_size = size
+
+                    line_text = " ".join(span_texts[line_start:]).strip()
+                    if line_text:
+                        # Interned so repeated lines (headers, table cells) share one string object
+                        normalized_line_text = intern(' '.join(line_text.split()))
+                        unique_lines[normalized_line_text] = max(unique_lines.get(normalized_line_text, 0), max_line_font_size)
 
         # --- Heuristic: Copyright/Legal Keywords (Optional, can be added if needed) ---
+        # Collect the stripped line texts into a list in the loop above, then:
+        # full_page_text = "\n".join(page_lines)
         # found_copyright_keyword = False
         # copyright_patterns = [
         #     r"copyright", r"all rights reserved", r"version \d+(\.\d+)*",
@@ -55,62 +198,52 @@ def _analyze_page_for_cover_characteristics(page, document, max_body_text_lines=
         #     if re.search(pattern, full_page_text, re.IGNORECASE):
         #         found_copyright_keyword = True
         #         break
-        # print(f"  found_copyright_keyword: {found_copyright_keyword}")
-
+        # log.debug("  found_copyright_keyword: %s", found_copyright_keyword)
 
-        # --- Heuristic 2: Image Presence ---
-        images_info = page.get_image_info() 
-        page_area = page.rect.width * page.rect.height
-        total_image_area = 0
 
-        for img_info in images_info:
-            if 'bbox' in img_info and 'width' in img_info and 'height' in img_info:
-                if img_info['width'] > 0 and img_info['height'] > 0:
-                    total_image_area += img_info['width'] * img_info['height']
-        
-        has_significant_image = (total_image_area / page_area if page_area > 0 else 0) > min_image_area_ratio
-        print(f"  has_significant_image: {has_significant_image} (Total area: {total_image_area:.2f}, Page area: {page_area:.2f}, Threshold: {min_image_area_ratio})")
-
-
-        if not spans:
-            print(f"  No text spans found. Is significant image? {has_significant_image}")
+        span_count = len(span_texts)
+        if not span_count:
+            has_significant_image = _has_significant_image(page, page_area, min_image_area_ratio)
+            log.debug("  No text spans found. Is significant image? %s", has_significant_image)
             if has_significant_image:
-                print(f"  Result for {page_name}: True (No text, significant image)")
+                log.debug("  Result for %s: True (No text, significant image)", page_name)
             else:
-                print(f"  Result for {page_name}: False (No text, no significant image)")
+                log.debug("  Result for %s: False (No text, no significant image)", page_name)
             return has_significant_image 
 
-        all_font_sizes = [s["size"] for s in spans]
-        if not all_font_sizes: 
-            print("  No font sizes found in spans. Returning False.")
-            print(f"  Result for {page_name}: False (No font sizes)")
+        span_sizes = np.array(span_sizes, dtype=np.float64)
+        if span_sizes.size == 0: 
+            log.debug("  No font sizes found in spans. Returning False.")
+            log.debug("  Result for %s: False (No font sizes)", page_name)
             return False 
         
-        avg_font_size = sum(all_font_sizes) / len(all_font_sizes)
-        max_font_size = max(all_font_sizes)
+        avg_font_size = float(span_sizes.mean())
+        max_font_size = float(span_sizes.max())
 
         has_a_large_font = max_font_size > avg_font_size * min_prominent_font_ratio
-        print(f"  has_a_large_font: {has_a_large_font} (Max: {max_font_size:.2f}, Avg: {avg_font_size:.2f}, Ratio Threshold: {min_prominent_font_ratio})")
+        log.debug("  has_a_large_font: %s (Max: %.2f, Avg: %.2f, Ratio Threshold: %s)",
+                  has_a_large_font, max_font_size, avg_font_size, min_prominent_font_ratio)
 
         # --- Heuristic 1: Body Text Density ---
+        # Cheapest strong rejector for content pages, so it runs before prominence, layout and image checks
         body_text_lines_count = 0
-        unique_lines = {} 
-        for b in text_blocks:
-            if b["type"] == 0:
-                for line in b["lines"]:
-                    line_text = " ".join(s["text"] for s in line["spans"]).strip()
-                    if line_text:
-                        max_line_font_size = max(s["size"] for s in line["spans"])
-                        normalized_line_text = ' '.join(line_text.split())
-                        unique_lines[normalized_line_text] = max(unique_lines.get(normalized_line_text, 0), max_line_font_size)
-
-        for line_text, line_font_size in unique_lines.items():
-            if line_font_size <= avg_font_size * 1.2 and len(line_text.split()) > 4 and line_font_size < max_font_size * 0.8:
-                body_text_lines_count += 1
+        # With no more distinct lines than the limit the page can't be rejected here, and the exact
+        # count only feeds the sparse-page fallback, which needs fewer than 10 spans. Skip the pass
+        # for such sparse, cover-like pages unless that fallback is in play.
+        if len(unique_lines) > max_body_text_lines or span_count < 10:
+            # Size test for all lines in one array comparison; only size-matching lines get their words counted
+            line_texts = list(unique_lines)
+            line_sizes = np.fromiter(unique_lines.values(), dtype=np.float64, count=len(line_texts))
+            body_size_mask = (line_sizes <= avg_font_size * 1.2) & (line_sizes < max_font_size * 0.8)
+            for line_idx in np.flatnonzero(body_size_mask):
+                if len(line_texts[line_idx].split()) > 4:
+                    body_text_lines_count += 1
+                    if body_text_lines_count > max_body_text_lines:
+                        break # Enough to reject the page
         
-        print(f"  body_text_lines_count: {body_text_lines_count} (Threshold: {max_body_text_lines})")
+        log.debug("  body_text_lines_count: %d (Threshold: %s)", body_text_lines_count, max_body_text_lines)
         if body_text_lines_count > max_body_text_lines:
-            print(f"  Result for {page_name}: False (Reason: Too many body text lines)")
+            log.debug("  Result for %s: False (Reason: Too many body text lines)", page_name)
             return False
 
 
@@ -118,45 +251,48 @@ def _analyze_page_for_cover_characteristics(page, document, max_body_text_lines=
         prominent_text_elements_count = 0
         processed_prominent_lines = set()
         
-        for span in sorted(spans, key=lambda s: s["size"], reverse=True):
-            text = span["text"].strip()
-            normalized_text = ' '.join(text.split())
+        prominent_font_threshold = avg_font_size * min_prominent_font_ratio
+
+        # Order doesn't matter for counting distinct prominent texts, so scan spans as they come
+        for span_idx in np.flatnonzero(span_sizes > prominent_font_threshold):
+            normalized_text = intern(' '.join(span_texts[span_idx].split()))
             if not normalized_text:
                 continue
 
-            if span["size"] > avg_font_size * min_prominent_font_ratio and normalized_text not in processed_prominent_lines:
+            if normalized_text not in processed_prominent_lines:
                 prominent_text_elements_count += 1
                 processed_prominent_lines.add(normalized_text)
+                if prominent_text_elements_count > max_prominent_elements:
+                    break # Already outside the expected range, no need to count further
         
-        print(f"  prominent_text_elements_count: {prominent_text_elements_count} (Min: {min_prominent_elements}, Max: {max_prominent_elements})")
+        log.debug("  prominent_text_elements_count: %d (Min: %s, Max: %s)",
+                  prominent_text_elements_count, min_prominent_elements, max_prominent_elements)
         if not (min_prominent_elements <= prominent_text_elements_count <= max_prominent_elements):
-            print(f"  Result for {page_name}: False (Reason: Prominent elements count outside expected range)")
+            log.debug("  Result for %s: False (Reason: Prominent elements count outside expected range)", page_name)
             return False
         
         # --- Heuristic 4: Main Title Centering and Vertical Position ---
         is_main_title_centered = False
         is_main_title_high_enough = False
-        main_title_span = None
-        if spans:
-            main_title_span = max(spans, key=lambda s: s["size"]) 
         
-        if main_title_span:
+        if main_title_span and has_a_large_font: # Without a large font the page can't pass the primary criteria
             main_title_bbox = main_title_span["bbox"]
-            page_width = page.rect.width
-            page_height = page.rect.height
             center_x_title = (main_title_bbox[0] + main_title_bbox[2]) / 2
             center_x_page = page_width / 2
-            is_main_title_centered = abs(center_x_title - center_x_page) / page_width < title_centering_threshold
-            print(f"  is_main_title_centered: {is_main_title_centered} (Deviation: {abs(center_x_title - center_x_page) / page_width:.2f}, Threshold: {title_centering_threshold})")
+            title_center_deviation = abs(center_x_title - center_x_page) / page_width
+            is_main_title_centered = title_center_deviation < title_centering_threshold
+            log.debug("  is_main_title_centered: %s (Deviation: %.2f, Threshold: %s)",
+                      is_main_title_centered, title_center_deviation, title_centering_threshold)
 
             # Check vertical position: is the top of the title within the top X% of the page?
             # Smaller ratio means higher up the page (e.g., 0.5 means top half)
             vertical_pos_ratio = main_title_bbox[1] / page_height
             is_main_title_high_enough = vertical_pos_ratio < title_vertical_pos_threshold
-            print(f"  is_main_title_high_enough: {is_main_title_high_enough} (Top Y ratio: {vertical_pos_ratio:.2f}, Threshold: {title_vertical_pos_threshold})")
+            log.debug("  is_main_title_high_enough: %s (Top Y ratio: %.2f, Threshold: %s)",
+                      is_main_title_high_enough, vertical_pos_ratio, title_vertical_pos_threshold)
 
         # --- Final Decision Logic ---
-        is_very_sparse_overall = len(spans) < 10 and body_text_lines_count == 0
+        is_very_sparse_overall = span_count < 10 and body_text_lines_count == 0
 
         is_likely_cover = (body_text_lines_count <= max_body_text_lines and 
                            has_a_large_font and 
@@ -166,22 +302,61 @@ def _analyze_page_for_cover_characteristics(page, document, max_body_text_lines=
                            prominent_text_elements_count <= max_prominent_elements) # Ensure not too many
 
         # Fallback for image-heavy or extremely sparse covers or those with copyright keywords
-        is_fallback_cover = is_very_sparse_overall and has_significant_image # Removed keyword check from here, can be added as separate param if needed
+        is_fallback_cover = is_very_sparse_overall and _has_significant_image(page, page_area, min_image_area_ratio) # Removed keyword check from here, can be added as separate param if needed
 
-        print(f"  is_likely_cover (primary criteria): {is_likely_cover}")
-        print(f"  is_fallback_cover (sparse/image): {is_fallback_cover}")
+        log.debug("  is_likely_cover (primary criteria): %s", is_likely_cover)
+        log.debug("  is_fallback_cover (sparse/image): %s", is_fallback_cover)
 
         final_result = is_likely_cover or is_fallback_cover
-        print(f"  Result for {page_name}: {final_result}")
+        log.debug("  Result for %s: %s", page_name, final_result)
         return final_result
 
     except Exception as e:
-        print(f"Error analyzing page for cover characteristics in _analyze_page_for_cover_characteristics: {e}")
-        return False
+        log.warning("Error analyzing page for cover characteristics in _analyze_page_for_cover_characteristics: %s", e)
+        return None
+
+def is_cover_page_doc(document, page_number=0, **kwargs):
+    """
+    Determines if a specific page of an already opened PDF is a cover page.
+    The caller owns the document; it is not closed here.
+
+    Args:
+        document (fitz.Document): The opened PDF document.
+        page_number (int): The 0-indexed page number to check. Defaults to 0 (first page).
+        **kwargs: Optional heuristic parameters, see is_cover_page.
+
+    Returns:
+        bool: True if the specified page is likely a cover page, False otherwise.
+    """
+    key = _cover_cache_key(document.name, page_number, kwargs)
+    result = _cover_cache_get(key)
+    if result is None:
+        result = _check_cover_page(document, page_number, **kwargs)
+        if result is None: # Failed check, reported as not a cover but never cached
+            return False
+        _cover_cache_put(key, result)
+    return result
+
+def _check_cover_page(document, page_number, **kwargs):
+    """
+    Uncached body of is_cover_page_doc. Returns None instead of False if the check failed.
+    """
+    try:
+        if document.page_count <= page_number:
+            log.error("Page %d does not exist in %s. Document has %d pages.", page_number, document.name, document.page_count)
+            return None
+
+        page = document.load_page(page_number)
+        return _analyze_page_for_cover_characteristics(page, document, **kwargs) # Pass document object
+
+    except Exception as e:
+        log.error("Error processing PDF '%s' in is_cover_page_doc: %s", document.name, e)
+        return None
 
 def is_cover_page(pdf_path, page_number=0, **kwargs):
     """
     Determines if a specific page of a PDF is a cover page.
+    Completed checks are cached per file path, size and mtime (see COVER_CACHE_PATH).
 
     Args:
         pdf_path (str): The path to the PDF file.
@@ -199,18 +374,20 @@ def is_cover_page(pdf_path, page_number=0, **kwargs):
     Returns:
         bool: True if the specified page is likely a cover page, False otherwise.
     """
+    key = _cover_cache_key(pdf_path, page_number, kwargs)
+    result = _cover_cache_get(key)
+    if result is not None:
+        return result
+
     try:
-        document = fitz.open(pdf_path)
-        if document.page_count <= page_number:
-            print(f"Error: Page {page_number} does not exist in {pdf_path}. Document has {document.page_count} pages.")
+        with fitz.open(pdf_path) as document: # Closed even if the check raises
+            result = _check_cover_page(document, page_number, **kwargs)
+        if result is None:
             return False
-
-        page = document.load_page(page_number)
-        result = _analyze_page_for_cover_characteristics(page, document, **kwargs) # Pass document object
-        document.close()
+        _cover_cache_put(key, result)
         return result
 
     except Exception as e:
-        print(f"Error opening or processing PDF '{pdf_path}' in is_cover_page: {e}")
+        log.error("Error opening or processing PDF '%s' in is_cover_page: %s", pdf_path, e)
         return False
 
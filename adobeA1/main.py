@@ -2,39 +2,76 @@
 
 import os
 import json
+import logging
+import fitz # PyMuPDF
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from TitleFinder import TitleFinder
 from PDFOutlineExtractor import PDFOutlineExtractor
-from cover_page import is_cover_page # Import the new function
+from cover_page import is_cover_page_doc # Import the new function
 
-def process_pdf(input_path: str, output_path: str):
+try:
+    import orjson # Compiled serializer, much faster than json for the indented output
+except ImportError:
+    orjson = None
+
+log = logging.getLogger(__name__)
+
+# Per-process TitleFinder / PDFOutlineExtractor, built once by _init_worker and
+# reused for every PDF the process handles
+_title_finder = None
+_extractor = None
+
+def _init_worker():
+    global _title_finder, _extractor
+    _title_finder = TitleFinder()
+    _extractor = PDFOutlineExtractor()
+
+def process_pdf(input_path: str, output_path: str, title_finder: TitleFinder = None,
+                extractor: PDFOutlineExtractor = None):
     """
     Processes a single PDF file to extract its title and outline (headings),
     then saves the information to a JSON file.
     Also identifies if the first page is a cover page and informs the outline extractor.
+    The PDF is opened once and the same document is shared by all three steps.
+    title_finder and extractor default to the worker's shared instances (or fresh ones
+    outside a worker).
     """
-    # print(f"Processing PDF: {input_path}...")
-    
-    # Initialize the TitleFinder and extract the title
-    title_finder = TitleFinder()
-    title = ""
+    # log.debug("Processing PDF: %s...", input_path)
+    if title_finder is None:
+        title_finder = _title_finder if _title_finder is not None else TitleFinder()
+    if extractor is None:
+        extractor = _extractor if _extractor is not None else PDFOutlineExtractor()
+
     try:
-        title_info = title_finder.find_title(input_path)
-        title = title_info.get("title", os.path.splitext(os.path.basename(input_path))[0])
+        document = fitz.open(input_path)
     except Exception as e:
-        print(f"Warning: Title extraction failed for {input_path}: {e}. Using filename as title.")
-        title = os.path.splitext(os.path.basename(input_path))[0]
+        # Unreadable PDF: still write a result, titled after the file with an empty outline
+        log.error("Could not open %s: %s", input_path, e)
+        _save_result({"title": os.path.splitext(os.path.basename(input_path))[0], "outline": []}, output_path)
+        return
+
+    try:
+        # Extract the title
+        title = ""
+        try:
+            title_info = title_finder.find_title_doc(document)
+            title = title_info.get("title", os.path.splitext(os.path.basename(input_path))[0])
+        except Exception as e:
+            log.warning("Title extraction failed for %s: %s. Using filename as title.", input_path, e)
+            title = os.path.splitext(os.path.basename(input_path))[0]
 
-    # Check if the first page is a cover page
-    is_first_page_cover = is_cover_page(input_path, page_number=0)
-    # print(f"Is the first page of '{os.path.basename(input_path)}' a cover page? {is_first_page_cover}")
+        # Check if the first page is a cover page
+        is_first_page_cover = is_cover_page_doc(document, page_number=0)
+        # log.debug("Is the first page of '%s' a cover page? %s", os.path.basename(input_path), is_first_page_cover)
 
-    # Initialize the PDFOutlineExtractor and pass the cover page info
-    # The extractor will now internally decide the starting page based on this flag
-    extractor = PDFOutlineExtractor(document_title=title, is_first_page_cover=is_first_page_cover)
-    outline = extractor.extract_outline(input_path)
+        # Pass the title and cover page info to the PDFOutlineExtractor
+        # The extractor will now internally decide the starting page based on this flag
+        outline = extractor.extract_outline_doc(document, document_title=title, is_first_page_cover=is_first_page_cover)
+    finally:
+        document.close()
 
     # The outline_starts_from_page can be derived directly from the extractor's state if needed,
-    # or you can just rely on the print statement from within PDFOutlineExtractor.
+    # or you can just rely on the log output from within PDFOutlineExtractor.
     # For consistency, we'll still add it to the result dictionary based on the flag.
     outline_start_page_num = 2 if is_first_page_cover else 1
 
@@ -45,33 +82,55 @@ def process_pdf(input_path: str, output_path: str):
         "outline": outline
     }
 
-    # Save the result to a JSON file
+    _save_result(result, output_path)
+
+
+def _save_result(result: dict, output_path: str):
+    """
+    Saves the result dictionary to a JSON file.
+    """
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
-        print(f"Successfully saved outline to {output_path}")
+        if orjson is not None:
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2, ensure_ascii=False)
+        log.info("Successfully saved outline to %s", output_path)
     except Exception as e:
-        print(f"Error saving outline to {output_path}: {e}")
+        log.error("Error saving outline to %s: %s", output_path, e)
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+
     input_dir = "input"
     output_dir = "output"
     
     # Ensure output directory exists
     os.makedirs(output_dir, exist_ok=True)
 
-    # Process all PDF files in the input directory
-    pdf_files = [f for f in os.listdir(input_dir) if f.lower().endswith(".pdf")]
+    # Process all PDF files in the input directory.
+    # Each PDF is independent, so process them in separate worker processes.
+    # Only paths cross the process boundary: every worker opens its own fitz.Document
+    # inside process_pdf and nothing from MuPDF is created in the parent, so the pool
+    # works with both fork (Linux) and spawn (the macOS/Windows default).
+    with ProcessPoolExecutor(max_workers=os.cpu_count() or 1, initializer=_init_worker) as executor:
+        futures = {}
+        # os.scandir yields DirEntry objects with cached file type, and each PDF is
+        # submitted as soon as it is found so workers start while the scan continues
+        with os.scandir(input_dir) as entries:
+            for entry in entries:
+                if not (entry.is_file() and entry.name.lower().endswith(".pdf")):
+                    continue
+                output_path = os.path.join(output_dir, f"{os.path.splitext(entry.name)[0]}.json")
+                futures[executor.submit(process_pdf, entry.path, output_path)] = entry.name
+
+        if not futures:
+            log.warning("No PDF files found in the '%s' directory. Please place your PDFs there.", input_dir)
 
-    if not pdf_files:
-        print(f"No PDF files found in the '{input_dir}' directory. Please place your PDFs there.")
-    else:
-        for filename in pdf_files:
-            input_path = os.path.join(input_dir, filename)
-            output_path = os.path.join(output_dir, f"{os.path.splitext(filename)[0]}.json")
-            
+        for future in as_completed(futures):
             try:
-                process_pdf(input_path, output_path)
+                future.result()
             except Exception as e:
-                print(f"An unexpected error occurred while processing {filename}: {str(e)}")
\ No newline at end of file
+                log.error("An unexpected error occurred while processing %s: %s", futures[future], e)